@@ -0,0 +1 @@
+# Makes the `functions` and `models` packages importable from the tests
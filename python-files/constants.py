@@ -0,0 +1,12 @@
+import numpy as np
+
+# ---------------------
+# Month lengths
+# ---------------------
+DAYS_PER_MONTH = np.array(
+    [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int32)  # d
+SECONDS_TO_MSEC = 24 * 3600 / 1_000_000  # Ms per day
+
+# t_m [Ms]: Month time length (numpy.ndarray (12,)), read-only and shared by all sectors
+T_M_DEFAULT = (DAYS_PER_MONTH * SECONDS_TO_MSEC).astype(np.float64)
+T_M_DEFAULT.setflags(write=False)
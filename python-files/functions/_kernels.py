@@ -0,0 +1,110 @@
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional: callers fall back to the NumPy path
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# ---------------------
+# Compiled kernels
+# ---------------------
+# Single-pass versions of the monthly balance (gains, losses, heat balance
+# ratio, utilization factor, allowance factor and net demand), one loop over
+# the months with no temporary arrays. Outputs are written into `out`.
+# NaN can come out of valid inputs (negative heat balance ratio when T_e is
+# above the set-point), so only NaN/inf-safe fast-math flags are enabled.
+
+_FASTMATH = {'contract', 'arcp'}
+
+
+@njit(cache=True, fastmath=_FASTMATH, error_model='numpy')
+def utilization_factor(gamma, a):
+    """
+    Utilization factor [-] for one month, with the gamma == 1 limit a/(a+1)
+    (same tolerance as numpy.isclose)
+    """
+    if abs(gamma - 1.0) <= 1e-8 + 1e-5:
+        return a/(a+1.0)
+    gamma_pow_a = gamma**a
+    return (1.0-gamma_pow_a)/(1.0-gamma_pow_a*gamma)
+
+
+@njit(cache=True, fastmath=_FASTMATH, error_model='numpy')
+def heating_kernel(a, Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m, out):
+    """
+    Net heating demand [MJ] (see net_heating_energy_needs.net_heating_demand)
+    """
+    for m in range(out.shape[0]):
+        Q_loss = Q_trans_heat_sec_i_m[m] + Q_vent_heat_sec_i_m[m]  # MJ
+        Q_gain = Q_int_heat_sec_i_m[m] + Q_solar_heat_sec_i_m[m]  # MJ
+        # No losses: gamma = +inf, outside the allowance range
+        if Q_loss != 0.0 and Q_gain / Q_loss < 2.5:
+            out[m] = Q_loss - utilization_factor(Q_gain / Q_loss, a) * Q_gain
+        else:
+            out[m] = 0.0
+    return out
+
+
+@njit(cache=True, fastmath=_FASTMATH, error_model='numpy')
+def cooling_kernel(a_m, Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m, p_cool_sec_i, out):
+    """
+    Net cooling demand [MJ] (see net_cooling_energy_needs.net_cooling_demand)
+    """
+    for m in range(out.shape[0]):
+        Q_loss = Q_trans_cool_sec_i_m[m] + Q_vent_cool_sec_i_m[m]  # MJ
+        Q_gain = Q_int_cool_sec_i_m[m] + Q_solar_cool_sec_i_m[m]  # MJ
+        # No gains: lambda = +inf, outside the allowance range
+        if Q_gain != 0.0 and Q_loss / Q_gain < 2.5:
+            out[m] = p_cool_sec_i * \
+                (Q_gain - utilization_factor(Q_loss / Q_gain, a_m[m]) * Q_loss)
+        else:
+            out[m] = 0.0
+    return out
+
+
+@njit(cache=True, fastmath=_FASTMATH, error_model='numpy')
+def overheating_degree_kernel(a_m, H_trans_overh_sec_i, H_vent_overh_sec_i_m, Q_solar_overh_sec_i_m, Q_int_overh_sec_i_m, Q_trans_overh_sec_i_m, Q_vent_overh_sec_i_m):
+    """
+    Yearly overheating degree [Kh] (see net_overheating_risk.yearly_overheating_degree),
+    accumulated month by month without a monthly array
+    """
+    I_overh = 0.0
+    for m in range(Q_int_overh_sec_i_m.shape[0]):
+        Q_loss = Q_trans_overh_sec_i_m[m] + Q_vent_overh_sec_i_m[m]  # MJ
+        Q_gain = Q_int_overh_sec_i_m[m] + Q_solar_overh_sec_i_m[m]  # MJ
+        # No losses: gamma = +inf, the utilization factor tends to 0
+        eta_util = utilization_factor(
+            Q_gain / Q_loss, a_m[m]) if Q_loss != 0.0 else 0.0
+        I_overh += (1.0 - eta_util) * Q_gain / \
+            (H_trans_overh_sec_i + H_vent_overh_sec_i_m[m])
+    return I_overh * (1_000 / 3.6)  # Kh
+
+
+@njit(cache=True, parallel=True, error_model='numpy')
+def heating_kernel_batched(a, Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m, out):
+    """
+    Net heating demand [MJ] for Z sectors at once:
+    `a` is a (Z,) array, monthly values and `out` are (Z, 12) arrays
+    """
+    for z in prange(out.shape[0]):
+        heating_kernel(a[z], Q_solar_heat_sec_i_m[z], Q_int_heat_sec_i_m[z],
+                       Q_trans_heat_sec_i_m[z], Q_vent_heat_sec_i_m[z], out[z])
+    return out
+
+
+@njit(cache=True, parallel=True, error_model='numpy')
+def cooling_kernel_batched(a_m, Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m, p_cool_sec_i, out):
+    """
+    Net cooling demand [MJ] for Z sectors at once:
+    `p_cool_sec_i` is a (Z,) array, `a_m`, monthly values and `out` are (Z, 12) arrays
+    """
+    for z in prange(out.shape[0]):
+        cooling_kernel(a_m[z], Q_solar_cool_sec_i_m[z], Q_int_cool_sec_i_m[z],
+                       Q_trans_cool_sec_i_m[z], Q_vent_cool_sec_i_m[z], p_cool_sec_i[z], out[z])
+    return out
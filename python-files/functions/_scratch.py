@@ -0,0 +1,40 @@
+import threading
+
+import numpy as np
+
+# ---------------------
+# Scratch buffers
+# ---------------------
+# Per-thread work arrays reused for the intermediate results of the monthly
+# balance (Q_loss, Q_gain, gamma...), so repeated calls do not allocate them.
+# Only the (12,) month shape is cached: batched (Z, 12) calls get freshly
+# allocated buffers, so sweeps over many Z do not keep them alive.
+# buf0..buf3 are free for the caller, `power` is reserved for
+# thermal_parameters.utilization_factor.
+# Never return a scratch buffer: the next call overwrites it.
+
+_CACHED_SHAPE = (12,)
+
+_local = threading.local()
+
+
+class _Scratch:
+    __slots__ = ('buf0', 'buf1', 'buf2', 'buf3', 'power')
+
+    def __init__(self, shape, dtype):
+        for name in self.__slots__:
+            setattr(self, name, np.empty(shape, dtype=dtype))
+
+
+def scratch(shape, dtype=np.float64):
+    """
+    Scratch buffers of the given shape and dtype for the current thread (_Scratch)
+    """
+    if shape != _CACHED_SHAPE:
+        return _Scratch(shape, dtype)
+    cache = _local.__dict__.setdefault('cache', {})
+    key = np.dtype(dtype)
+    s = cache.get(key)
+    if s is None:
+        s = cache[key] = _Scratch(shape, dtype)
+    return s
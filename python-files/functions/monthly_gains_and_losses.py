@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 import numpy as np
 
 
@@ -31,79 +33,131 @@ def solar_gains_cooling():
 # ---------------------
 # Internal Gains
 # ---------------------
-def internal_gains(V_sec_i: float, t_m: list) -> list:
+def internal_gains(V_sec_i: float, t_m: np.ndarray, dtype=np.float64) -> np.ndarray:
     """
     Internal gains (monthly)
     Inputs:
-            - V_sec_i [m³]: House / appartment total volume (float)
+            - V_sec_i [m³]: House / appartment total volume (float or numpy.ndarray (N,))
             - t_m [Ms]: Month time length (numpy.ndarray (12,))
+            - dtype: Floating point precision of the monthly values (default = numpy.float64)
     Outputs:
-            - Internal gains [MJ]: Monthly internal gains for heating, overheating and cooling (numpy.ndarray (12,))
+            - Internal gains [MJ]: Monthly internal gains for heating, overheating and cooling (numpy.ndarray (12,) or (N, 12))
     """
-    t_m = np.array(t_m)
+    t_m = np.asarray(t_m, dtype=dtype)
     V_EPR = V_sec_i  # m³
 
-    if V_EPR <= 192:
-        Q_int_sec_i_m = (1.41 * V_EPR + 78) * V_sec_i/V_EPR * t_m  # MJ
+    # V_sec_i/V_EPR == 1 since the sector is the whole EPR volume
+    if not isinstance(V_EPR, np.ndarray):
+        # Single sector: plain float, so the product below keeps t_m's dtype
+        if V_EPR <= 192:
+            q_int_sec_i = float(1.41 * V_EPR + 78)  # W
+        else:
+            q_int_sec_i = float(0.67 * V_EPR + 220)  # W
     else:
-        Q_int_sec_i_m = (0.67 * V_EPR + 220) * V_sec_i/V_EPR * t_m  # MJ
+        q_int_sec_i = np.where(V_EPR <= 192, 1.41 * V_EPR + 78,
+                               0.67 * V_EPR + 220).astype(dtype)[..., None]  # W
+
+    Q_int_sec_i_m = q_int_sec_i * t_m  # MJ
+    Q_int_sec_i_m.setflags(write=False)  # may be shared, e.g. by the three EnergySector regimes
 
-    return Q_int_sec_i_m.tolist()
+    return Q_int_sec_i_m
 
 
-def internal_gains_heating(V_sec_i: float, t_m: list) -> list:
-    Q_int_heat_sec_i_m = internal_gains(V_sec_i, t_m)
+def internal_gains_heating(V_sec_i: float, t_m: np.ndarray, dtype=np.float64) -> np.ndarray:
+    Q_int_heat_sec_i_m = internal_gains(V_sec_i, t_m, dtype)
     return Q_int_heat_sec_i_m
 
 
-def internal_gains_overheating(V_sec_i: float, t_m: list) -> list:
-    Q_int_overh_sec_i_m = internal_gains(V_sec_i, t_m)
+def internal_gains_overheating(V_sec_i: float, t_m: np.ndarray, dtype=np.float64) -> np.ndarray:
+    Q_int_overh_sec_i_m = internal_gains(V_sec_i, t_m, dtype)
     return Q_int_overh_sec_i_m
 
 
-def internal_gains_cooling(V_sec_i: float, t_m: list) -> list:
-    Q_int_cool_sec_i_m = internal_gains(V_sec_i, t_m)
+def internal_gains_cooling(V_sec_i: float, t_m: np.ndarray, dtype=np.float64) -> np.ndarray:
+    Q_int_cool_sec_i_m = internal_gains(V_sec_i, t_m, dtype)
     return Q_int_cool_sec_i_m
 
 
+# ---------------------
+# Driving forces
+# ---------------------
+@dataclass(frozen=True)
+class MonthlyDrivers:
+    """
+    Monthly temperature difference times month length, shared by transmission and ventilation losses
+    Inputs:
+            - T_e_m [°C]: Monthly average outdoor temperature (numpy.ndarray (12,))
+            - t_m [Ms]: Month time length (numpy.ndarray (12,))
+            - dtype: Floating point precision of the monthly values (default = numpy.float64)
+    Attributes:
+            - dt_heat [K.Ms]: (18 - T_e_m) * t_m, heating (numpy.ndarray (12,))
+            - dt_cool [K.Ms]: (23 - (T_e_m + 1)) * t_m, overheating and cooling (numpy.ndarray (12,))
+    """
+    dt_heat: np.ndarray
+    dt_cool: np.ndarray
+
+    @classmethod
+    def from_climate(cls, T_e_m, t_m, dtype=np.float64):
+        T_e_m = np.asarray(T_e_m, dtype=dtype)
+        t_m = np.asarray(t_m, dtype=dtype)
+        return cls(_dt_heat(T_e_m, t_m, dtype), _dt_cool(T_e_m, t_m, dtype))
+
+
+# Single driving forces, computed directly by the losses when no
+# MonthlyDrivers is passed (only the one that is needed)
+def _dt_heat(T_e_m, t_m, dtype):
+    return (18 - np.asarray(T_e_m, dtype=dtype)) * np.asarray(t_m, dtype=dtype)  # K.Ms
+
+
+def _dt_cool(T_e_m, t_m, dtype):
+    # 23 - (T_e_m + 1)
+    return (22 - np.asarray(T_e_m, dtype=dtype)) * np.asarray(t_m, dtype=dtype)  # K.Ms
+
+
 # ---------------------
 # Transmission losses
 # ---------------------
+# N sectors at once: pass the coefficients as (N, 1) columns (e.g. H[:, None])
+# so they broadcast against the (12,) months into (N, 12) losses; (12,)
+# coefficients are monthly values, as in the overheating and cooling
+# ventilation losses.
 def transmission_losses(H_trans_sec_i, T_i_m, T_e_m, t_m):
     """
     Transmission losses (monthly)
     Inputs:
-            - H_trans_sec_i [W/K]: Transmission heat transfer coefficient for heating/overheating/cooling (float)            
+            - H_trans_sec_i [W/K]: Transmission heat transfer coefficient for heating/overheating/cooling (float, or numpy.ndarray (N, 1) for N sectors)            
             - T_i_m [°C]: Monthly average indoor temperature (numpy.ndarray (12,))
             - T_e_m [°C]: Monthly average outdoor temperature (numpy.ndarray (12,))
             - t_m [Ms]: Month time length (numpy.ndarray (12,))
     Outputs:
-            - Transmission losses [MJ]: Monthly transmission losses for heating, overheating and cooling (numpy.ndarray (12,))
+            - Transmission losses [MJ]: Monthly transmission losses for heating, overheating and cooling (numpy.ndarray (12,) or (N, 12))
     """
     Q_trans_sec_i_m = H_trans_sec_i * (T_i_m - T_e_m) * t_m  # MJ
     return Q_trans_sec_i_m
 
 
-def transmission_losses_heating(H_trans_heat_sec_i, T_e_m, t_m):
-    T_i_m = 18
-    Q_trans_heat_sec_i_m = transmission_losses(
-        H_trans_heat_sec_i, T_i_m, T_e_m, t_m)
+def transmission_losses_heating(H_trans_heat_sec_i, T_e_m=None, t_m=None, drivers=None, dtype=np.float64):
+    if drivers is None:
+        dt_heat = _dt_heat(T_e_m, t_m, dtype)
+    else:
+        dt_heat = drivers.dt_heat
+    Q_trans_heat_sec_i_m = np.asarray(H_trans_heat_sec_i, dtype=dt_heat.dtype) * dt_heat  # MJ
     return Q_trans_heat_sec_i_m
 
 
-def transmission_losses_overheating(H_trans_overh_sec_i, T_e_m, t_m):
-    T_i_m = 23
-    T_e_m = T_e_m + 1
-    Q_trans_overh_sec_i_m = transmission_losses(
-        H_trans_overh_sec_i, T_i_m, T_e_m, t_m)  # MJ
+def transmission_losses_overheating(H_trans_overh_sec_i, T_e_m=None, t_m=None, drivers=None, dtype=np.float64):
+    if drivers is None:
+        dt_cool = _dt_cool(T_e_m, t_m, dtype)
+    else:
+        dt_cool = drivers.dt_cool
+    Q_trans_overh_sec_i_m = np.asarray(H_trans_overh_sec_i, dtype=dt_cool.dtype) * dt_cool  # MJ
     return Q_trans_overh_sec_i_m
 
 
-def transmission_losses_cooling(H_trans_cool_sec_i, T_e_m, t_m):
-    T_i_m = 23
-    T_e_m = T_e_m + 1
-    Q_trans_cool_sec_i_m = transmission_losses(
-        H_trans_cool_sec_i, T_i_m, T_e_m, t_m)  # MJ
+def transmission_losses_cooling(H_trans_cool_sec_i, T_e_m=None, t_m=None, drivers=None, dtype=np.float64):
+    # Same set-points as overheating
+    Q_trans_cool_sec_i_m = transmission_losses_overheating(
+        H_trans_cool_sec_i, T_e_m, t_m, drivers, dtype)  # MJ
     return Q_trans_cool_sec_i_m
 
 
@@ -111,30 +165,41 @@ def transmission_losses_cooling(H_trans_cool_sec_i, T_e_m, t_m):
 # Ventilation losses
 # ---------------------
 
-def ventilation_losses_heating(H_vent_heat_sec_i, T_e_m, t_m):
+def ventilation_losses_heating(H_vent_heat_sec_i, T_e_m=None, t_m=None, drivers=None, dtype=np.float64):
     """
     Ventilation losses (monthly)
     Inputs:
-            - H_vent_heat_sec_i [W/K]: Ventilation heat transfer coefficient (float)
-            - H_vent_overh_sec_i_m [W/K]: Monthly ventilation heat transfer coefficient (numpy.ndarray (12,))
-            - H_vent_cool_sec_i_m [W/K]: Monthly ventilation heat transfer coefficient (numpy.ndarray (12,))
+            - H_vent_heat_sec_i [W/K]: Ventilation heat transfer coefficient (float, or numpy.ndarray (N, 1) for N sectors)
+            - H_vent_overh_sec_i_m [W/K]: Monthly ventilation heat transfer coefficient (numpy.ndarray (12,) or (N, 12))
+            - H_vent_cool_sec_i_m [W/K]: Monthly ventilation heat transfer coefficient (numpy.ndarray (12,) or (N, 12))
             - T_e_m [°C]: Monthly average outdoor temperature (numpy.ndarray (12,))
             - t_m [Ms]: Month time length (numpy.ndarray (12,))
+            - drivers: Precomputed driving forces, used instead of T_e_m and t_m when given (MonthlyDrivers)
+            - dtype: Floating point precision when the driving forces are computed here (default = numpy.float64)
     Outputs:
-            - Ventilation losses [MJ]: Monthly ventilation losses for heating, cooling and overheating (numpy.ndarray (12,))
+            - Ventilation losses [MJ]: Monthly ventilation losses for heating, cooling and overheating (numpy.ndarray (12,) or (N, 12))
     """
-    Q_vent_heat_sec_i_m = H_vent_heat_sec_i * (18 - T_e_m) * t_m  # MJ
+    if drivers is None:
+        dt_heat = _dt_heat(T_e_m, t_m, dtype)
+    else:
+        dt_heat = drivers.dt_heat
+    Q_vent_heat_sec_i_m = np.asarray(H_vent_heat_sec_i, dtype=dt_heat.dtype) * dt_heat  # MJ
     return Q_vent_heat_sec_i_m
 
 
-def ventilation_losses_overheating(H_vent_overh_sec_i_m, T_e_m, t_m):
-    Q_vent_overh_sec_i_m = H_vent_overh_sec_i_m * \
-        (23 - (T_e_m + 1)) * t_m  # MJ
+def ventilation_losses_overheating(H_vent_overh_sec_i_m, T_e_m=None, t_m=None, drivers=None, dtype=np.float64):
+    if drivers is None:
+        dt_cool = _dt_cool(T_e_m, t_m, dtype)
+    else:
+        dt_cool = drivers.dt_cool
+    Q_vent_overh_sec_i_m = np.asarray(H_vent_overh_sec_i_m, dtype=dt_cool.dtype) * dt_cool  # MJ
     return Q_vent_overh_sec_i_m
 
 
-def ventilation_losses_cooling(H_vent_cool_sec_i_m, T_e_m, t_m):
-    Q_vent_cool_sec_i_m = H_vent_cool_sec_i_m * (23 - (T_e_m + 1)) * t_m  # MJ
+def ventilation_losses_cooling(H_vent_cool_sec_i_m, T_e_m=None, t_m=None, drivers=None, dtype=np.float64):
+    # Same set-points as overheating
+    Q_vent_cool_sec_i_m = ventilation_losses_overheating(
+        H_vent_cool_sec_i_m, T_e_m, t_m, drivers, dtype)  # MJ
     return Q_vent_cool_sec_i_m
 
 # if __name__ == "__main__":
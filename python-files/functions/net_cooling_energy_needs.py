@@ -1,7 +1,11 @@
 import numpy as np
 
+from functions._kernels import NUMBA_AVAILABLE, cooling_kernel, cooling_kernel_batched
+from functions._scratch import scratch
+from functions.thermal_parameters import balance_ratio, numerical_parameter, utilization_factor
 
-def net_cooling_demand(C_sec_i, H_trans_cool_sec_i, H_vent_cool_sec_i_m, Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m, p_cool_sec_i):
+
+def net_cooling_demand(C_sec_i, H_trans_cool_sec_i, H_vent_cool_sec_i_m, Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m, p_cool_sec_i, params=None, dtype=np.float64):
     """
     Net cooling demand [MJ]: Monthly net cooling demand (numpy.ndarray (12,))
 
@@ -15,43 +19,115 @@ def net_cooling_demand(C_sec_i, H_trans_cool_sec_i, H_vent_cool_sec_i_m, Q_solar
         - Q_trans_cool_sec_i_m [MJ]: Monthly transmission losses thermal zone (numpy.ndarray (12,))
         - Q_vent_cool_sec_i_m [MJ]: Monthly ventilation losses per thermal zone (numpy.ndarray (12,))
         - p_cool_sec_i [-]: Probability of active cooling (float)
+        - params: Precomputed numerical parameters, a_cool_m is used instead of C_sec_i and H when given (BuildingThermalParams)
+        - dtype: Floating point precision of the monthly values (default = numpy.float64)
 
     Outputs:
     -------
         - Net cooling demand [MJ]: Monthly net cooling demand (numpy.ndarray (12,))
     """
+    if params is None:
+        a_sec_i_m = numerical_parameter(
+            C_sec_i, H_trans_cool_sec_i, H_vent_cool_sec_i_m)
+    else:
+        a_sec_i_m = params.a_cool_m
+
+    Q_solar_cool_sec_i_m = np.asarray(Q_solar_cool_sec_i_m, dtype=dtype)
+    Q_int_cool_sec_i_m = np.asarray(Q_int_cool_sec_i_m, dtype=dtype)
+    Q_trans_cool_sec_i_m = np.asarray(Q_trans_cool_sec_i_m, dtype=dtype)
+    Q_vent_cool_sec_i_m = np.asarray(Q_vent_cool_sec_i_m, dtype=dtype)
+
+    # Compiled single-pass kernel (numba installed)
+    # ----------------------------------------------
+    if NUMBA_AVAILABLE:
+        return cooling_kernel(
+            np.asarray(a_sec_i_m, dtype=np.float64),
+            Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m,
+            p_cool_sec_i, np.empty_like(Q_trans_cool_sec_i_m))
+
+    return _net_cooling_demand(a_sec_i_m, Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m, p_cool_sec_i)
+
+
+def net_cooling_demand_batch(C_sec_i, H_trans_cool_sec_i, H_vent_cool_sec_i_m, Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m, p_cool_sec_i, dtype=np.float64):
+    """
+    Net cooling demand [MJ] of Z energy sectors at once (numpy.ndarray (Z, 12))
+
+    Inputs:
+    ------
+        - C_sec_i [J/K]: Effective heat capacity of each energy sector (numpy.ndarray (Z,))
+        - H_trans_cool_sec_i [W/K]: Transmission heat transfer coefficients (numpy.ndarray (Z,))
+        - H_vent_cool_sec_i_m [W/K]: Monthly ventilation heat transfer coefficients (numpy.ndarray (Z, 12))
+        - Q_solar_cool_sec_i_m [MJ]: Monthly solar gains (numpy.ndarray (Z, 12))
+        - Q_int_cool_sec_i_m [MJ]: Monthly internal gains (numpy.ndarray (Z, 12))
+        - Q_trans_cool_sec_i_m [MJ]: Monthly transmission losses (numpy.ndarray (Z, 12))
+        - Q_vent_cool_sec_i_m [MJ]: Monthly ventilation losses (numpy.ndarray (Z, 12))
+        - p_cool_sec_i [-]: Probability of active cooling of each sector (numpy.ndarray (Z,))
+        - dtype: Floating point precision of the monthly values (default = numpy.float64)
+
+    Outputs:
+    -------
+        - Net cooling demand [MJ]: Monthly net cooling demand per sector (numpy.ndarray (Z, 12))
+    """
+    # Sector values as (Z, 1) columns broadcast against the months
+    a_sec_i_m = numerical_parameter(
+        np.asarray(C_sec_i, dtype=np.float64)[:, None],
+        np.asarray(H_trans_cool_sec_i, dtype=np.float64)[:, None],
+        np.asarray(H_vent_cool_sec_i_m, dtype=np.float64))
+    p_cool_sec_i = np.asarray(p_cool_sec_i, dtype=np.float64)
+    Q_solar_cool_sec_i_m = np.asarray(Q_solar_cool_sec_i_m, dtype=dtype)
+    Q_int_cool_sec_i_m = np.asarray(Q_int_cool_sec_i_m, dtype=dtype)
+    Q_trans_cool_sec_i_m = np.asarray(Q_trans_cool_sec_i_m, dtype=dtype)
+    Q_vent_cool_sec_i_m = np.asarray(Q_vent_cool_sec_i_m, dtype=dtype)
+    if NUMBA_AVAILABLE:
+        return cooling_kernel_batched(
+            a_sec_i_m, Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m,
+            p_cool_sec_i, np.empty_like(Q_trans_cool_sec_i_m))
+
+    return _net_cooling_demand(
+        a_sec_i_m, Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m,
+        p_cool_sec_i[:, None].astype(Q_trans_cool_sec_i_m.dtype))
+
+
+def _net_cooling_demand(a_sec_i_m, Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m, p_cool_sec_i):
+    """
+    NumPy path of net_cooling_demand: all monthly values have the shape of Q_trans_cool_sec_i_m
+    ((12,) or (Z, 12)), the other arguments may broadcast against it ((Z, 1) columns)
+    """
+    # Intermediate results are written into reusable scratch buffers
+    s = scratch(Q_trans_cool_sec_i_m.shape, Q_trans_cool_sec_i_m.dtype)
 
     # Total gains and losses (energetic sector)
     # ------------------------------------------
-    Q_loss_cool_sec_i_m = Q_trans_cool_sec_i_m + Q_vent_cool_sec_i_m  # MJ
-    Q_gain_cool_sec_i_m = Q_int_cool_sec_i_m + Q_solar_cool_sec_i_m  # MJ
+    Q_loss_cool_sec_i_m = np.add(
+        Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m, out=s.buf0)  # MJ
+    Q_gain_cool_sec_i_m = np.add(
+        Q_int_cool_sec_i_m, Q_solar_cool_sec_i_m, out=s.buf1)  # MJ
 
     # Heat balance ratio
     # ------------------
-    lambda_cool_sec_i_m = heat_balance_ratio_cooling(
-        Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m)
+    # (computed from the sums above instead of calling heat_balance_ratio_cooling)
+    lambda_cool_sec_i_m = balance_ratio(
+        Q_loss_cool_sec_i_m, Q_gain_cool_sec_i_m, out=s.buf2)  # [-], monthly loss-gain rate
 
     # Utilization factor
     # -------------------
-    eta_util_cool_sec_i_m = utilization_factor_cooling(
-        C_sec_i, H_trans_cool_sec_i, H_vent_cool_sec_i_m, lambda_cool_sec_i_m)
+    eta_util_cool_sec_i_m = utilization_factor(lambda_cool_sec_i_m, a_sec_i_m)
 
     # Net space cooling demand, MJ
     # ------------------------------
-    Q_cool_net_princ_sec_i_m = Q_gain_cool_sec_i_m - \
-        eta_util_cool_sec_i_m * Q_loss_cool_sec_i_m
-
-    # Allowance factor
-    # ------------------
-    f_allow_cool_sec_i_m = allowance_factor_cooling(lambda_cool_sec_i_m)
-
-    # Applying allowance factor to cooling needs
-    # ------------------------------------------
-    Q_cool_net_princ_sec_i_m = Q_cool_net_princ_sec_i_m * f_allow_cool_sec_i_m
-
-    f_cool_geo_sec_i_m = 0
-    Q_cool_net_sec_i_m = p_cool_sec_i * \
-        (1 - f_cool_geo_sec_i_m) * Q_cool_net_princ_sec_i_m
+    # (written into the eta array, which is not needed afterwards)
+    Q_cool_net_sec_i_m = np.multiply(
+        eta_util_cool_sec_i_m, Q_loss_cool_sec_i_m, out=eta_util_cool_sec_i_m)
+    np.subtract(Q_gain_cool_sec_i_m, Q_cool_net_sec_i_m, out=Q_cool_net_sec_i_m)
+
+    # Applying allowance factor to cooling needs (see allowance_factor_cooling)
+    # --------------------------------------------------------------------------
+    # (set to 0 rather than multiplied, so a NaN month outside the range is 0 too)
+    np.copyto(Q_cool_net_sec_i_m, 0, where=~(lambda_cool_sec_i_m < 2.5))
+
+    # Geothermal cooling fraction f_cool_geo_sec_i_m = 0: the (1 - f_cool_geo_sec_i_m)
+    # factor is left out, add it back as an argument if it becomes a parameter
+    Q_cool_net_sec_i_m *= p_cool_sec_i
     return Q_cool_net_sec_i_m
 
 
@@ -71,24 +147,9 @@ def utilization_factor_cooling(C_sec_i, H_trans_cool_sec_i, H_vent_cool_sec_i_m,
         - Utilization factor (eta_util_cool_sec_i_m) [-]: Monthly utilization factor (numpy.ndarray (12,))
     """
 
-    tau_cool_sec_i_m = C_sec_i / \
-        (H_trans_cool_sec_i +
-         H_vent_cool_sec_i_m)  # s Time constant of the building zone
-    # [-] Dimensionless numerical parameter
-    a_sec_i_m = 1 + tau_cool_sec_i_m / 54_000
-
-    eta_util_cool_sec_i_m = np.array([])
-
-    for a, gamma in zip(a_sec_i_m.flatten(), lambda_cool_sec_i_m.flatten()):
-
-        if gamma == 1:
-            eta_util_cool_sec_i_m_j = a/(a+1)
-        else:
-            eta_util_cool_sec_i_m_j = (
-                1-gamma**a)/(1-gamma**(a+1))
-
-        eta_util_cool_sec_i_m = np.append(
-            eta_util_cool_sec_i_m, eta_util_cool_sec_i_m_j)
+    a_sec_i_m = numerical_parameter(
+        C_sec_i, H_trans_cool_sec_i, H_vent_cool_sec_i_m)
+    eta_util_cool_sec_i_m = utilization_factor(lambda_cool_sec_i_m, a_sec_i_m)
 
     return eta_util_cool_sec_i_m
 
@@ -110,13 +171,16 @@ def heat_balance_ratio_cooling(Q_solar_cool_sec_i_m, Q_int_cool_sec_i_m, Q_trans
     """
     # Gain and losses
     # ---------------
-    Q_loss_cool_sec_i_m = Q_trans_cool_sec_i_m + Q_vent_cool_sec_i_m  # MJ
-    Q_gain_cool_sec_i_m = Q_int_cool_sec_i_m + Q_solar_cool_sec_i_m  # MJ
+    s = scratch(np.shape(Q_trans_cool_sec_i_m))
+    Q_loss_cool_sec_i_m = np.add(
+        Q_trans_cool_sec_i_m, Q_vent_cool_sec_i_m, out=s.buf0)  # MJ
+    Q_gain_cool_sec_i_m = np.add(
+        Q_int_cool_sec_i_m, Q_solar_cool_sec_i_m, out=s.buf1)  # MJ
 
     # Heat balance ratio (lambda_cool_sec_i_m)
     # ----------------------------------------
-    lambda_cool_sec_i_m = Q_loss_cool_sec_i_m / \
-        Q_gain_cool_sec_i_m  # [-], monthly loss-gain rate
+    lambda_cool_sec_i_m = balance_ratio(
+        Q_loss_cool_sec_i_m, Q_gain_cool_sec_i_m)  # [-], monthly loss-gain rate
     return lambda_cool_sec_i_m
 
 
@@ -132,16 +196,6 @@ def allowance_factor_cooling(lambda_cool_sec_i_m):
     -------
         - Cooling allowance factor (f_allow_cool_sec_i_m) [-]: Monthly cooling allowance factor to be included when calculating net cooling demand (numpy.ndarray (12,))
     """
-    f_allow_cool_sec_i_m = np.array([])
-
-    for item in lambda_cool_sec_i_m.flatten():
-        if item < 2.5:
-            f_allow_cool_sec_i_m_j = 1
-        else:
-            f_allow_cool_sec_i_m_j = 0
-
-        f_allow_cool_sec_i_m = np.append(
-            f_allow_cool_sec_i_m, f_allow_cool_sec_i_m_j)
-    f_allow_cool_sec_i_m = f_allow_cool_sec_i_m.flatten()
+    f_allow_cool_sec_i_m = (lambda_cool_sec_i_m < 2.5).astype(lambda_cool_sec_i_m.dtype)
 
     return f_allow_cool_sec_i_m
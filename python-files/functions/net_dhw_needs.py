@@ -12,27 +12,25 @@ def net_dhw_demand(V_sec_i, t_m, N_bath=1, N_sink=1):
 
     Inputs:
     ------
-            - V_sec_i [m³]: House / appartment total volume (float)
+            - V_sec_i [m³]: House / appartment total volume (float or numpy.ndarray (N,))
             - t_m [Ms]: Month time length (numpy.ndarray (12,))
-            - N_bath [-]: Number of showers/bathrooms (default = 1) (float)
-            - N_sink [-]: Number of kitchen sinks (default = 1) (float)
+            - N_bath [-]: Number of showers/bathrooms (default = 1) (float), no effect: kept for compatibility
+            - N_sink [-]: Number of kitchen sinks (default = 1) (float), no effect: kept for compatibility
 
     Outputs:
     -------
             - Net domestic hot water demand (Q_water_sec_i_net_m) [MJ]: Monthly net domestic hot water demand (numpy.ndarray (12,))
     """
-    #  Domestic hot water need for each bath
-    # --------------------------------------
-    Q_water_bath_i_net_m = net_dhw_demand_bath(
-        V_sec_i, t_m, N_bath)
-
-    #  Domestic hot water need for each sink
-    # --------------------------------------
-    Q_water_sink_i_net_m = net_dhw_demand_sink(V_sec_i, t_m, N_sink)
+    # N_bath * (1/N_bath) and N_sink * (1/N_sink) cancel out: the sector
+    # demand is the sum of the bath and sink coefficients times t_m
+    V_EPR = np.asarray(V_sec_i)  # m³
+    V_excess = np.maximum(0, V_EPR - 192)  # m³
+    q_water_bath_i_net = 64 + 0.220 * V_excess
+    q_water_sink_i_net = 16 + 0.055 * V_excess
 
     #  Domestic hot water need for the entire energetic sector
     # --------------------------------------------------------
-    Q_water_sec_i_net_m = N_bath * Q_water_bath_i_net_m + N_sink * Q_water_sink_i_net_m
+    Q_water_sec_i_net_m = (q_water_bath_i_net + q_water_sink_i_net)[..., None] * t_m  # MJ
     return Q_water_sec_i_net_m
 
 
@@ -42,7 +40,7 @@ def net_dhw_demand_bath(V_sec_i, t_m, N_bath=1, r_water_bath_i_net=1):
 
     Inputs:
     ------
-        - V_sec_i [m³]: House / appartment total volume (float)
+        - V_sec_i [m³]: House / appartment total volume (float or numpy.ndarray (N,))
         - t_m [Ms]: Month time length (numpy.ndarray (12,))
         - N_bath [-]: Number of showers/bathrooms (default = 1) (float)
         - r_water_bath_i_net [-]: Reduction factor for pre-heating (default = 1) (float)
@@ -52,10 +50,11 @@ def net_dhw_demand_bath(V_sec_i, t_m, N_bath=1, r_water_bath_i_net=1):
         - Net domestic hot water demand for each bath (Q_water_bath_i_net_m) [MJ]: Monthly net domestic hot water demand (numpy.ndarray (12,))         
     """
 
-    V_EPR = V_sec_i  # m³
+    V_EPR = np.asarray(V_sec_i)  # m³
     f_bath_i = 1 / N_bath
+    q_water_bath_i_net = np.maximum(64, 64 + 0.220 * (V_EPR - 192))
     Q_water_bath_i_net_m = r_water_bath_i_net * f_bath_i * \
-        max(64, 64 + 0.220 * (V_EPR - 192)) * t_m  # MJ
+        q_water_bath_i_net[..., None] * t_m  # MJ
     return Q_water_bath_i_net_m
 
 
@@ -65,7 +64,7 @@ def net_dhw_demand_sink(V_sec_i, t_m, N_sink=1, r_water_sink_i_net=1):
 
     Inputs:
     ------
-        - V_sec_i [m³]: House / appartment total volume (float)
+        - V_sec_i [m³]: House / appartment total volume (float or numpy.ndarray (N,))
         - t_m [Ms]: Month time length (numpy.ndarray (12,))
         - N_sink [-]: Number of kitchen sinks (default = 1) (float)
         - r_water_sink_i_net [-]: Reduction factor for pre-heating (default = 1) (float)
@@ -74,8 +73,9 @@ def net_dhw_demand_sink(V_sec_i, t_m, N_sink=1, r_water_sink_i_net=1):
     -------
         - Net domestic hot water demand for each bath (Q_water_bath_i_net_m) [MJ]: Monthly net domestic hot water demand (numpy.ndarray (12,))
     """
-    V_EPR = V_sec_i  # m³
+    V_EPR = np.asarray(V_sec_i)  # m³
     f_sink_i = 1 / N_sink
+    q_water_sink_i_net = np.maximum(16, 16 + 0.055 * (V_EPR - 192))
     Q_water_sink_i_net_m = r_water_sink_i_net * f_sink_i * \
-        max(16, 16 + 0.055 * (V_EPR - 192)) * t_m
+        q_water_sink_i_net[..., None] * t_m  # MJ
     return Q_water_sink_i_net_m
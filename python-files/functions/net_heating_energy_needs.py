@@ -1,10 +1,14 @@
 import numpy as np
 
+from functions._kernels import NUMBA_AVAILABLE, heating_kernel, heating_kernel_batched
+from functions._scratch import scratch
+from functions.thermal_parameters import balance_ratio, numerical_parameter, utilization_factor
+
 
 # ---------------------
 # Net Heating Needs
 # ---------------------
-def net_heating_demand(C_sec_i, H_trans_heat_sec_i, H_vent_heat_sec_i, Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m):
+def net_heating_demand(C_sec_i, H_trans_heat_sec_i, H_vent_heat_sec_i, Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m, params=None, dtype=np.float64):
     """
     Net heating demand [MJ]: Monthly net heating demand (numpy.ndarray (12,))
 
@@ -17,39 +21,106 @@ def net_heating_demand(C_sec_i, H_trans_heat_sec_i, H_vent_heat_sec_i, Q_solar_h
         - Q_int_heat_sec_i_m [MJ]: Monthly internal gains per thermal zone (numpy.ndarray (12,))
         - Q_trans_heat_sec_i_m [MJ]: Monthly transmission losses thermal zone (numpy.ndarray (12,))
         - Q_vent_heat_sec_i_m [MJ]: Monthly ventilation losses per thermal zone (numpy.ndarray (12,))       
+        - params: Precomputed numerical parameters, a_heat is used instead of C_sec_i and H when given (BuildingThermalParams)
+        - dtype: Floating point precision of the monthly values (default = numpy.float64)
 
     Outputs:
     -------
         - Net heating demand [MJ]: Monthly net heating demand (numpy.ndarray (12,))
     """
+    if params is None:
+        a = numerical_parameter(C_sec_i, H_trans_heat_sec_i, H_vent_heat_sec_i)
+    else:
+        a = params.a_heat
+
+    Q_solar_heat_sec_i_m = np.asarray(Q_solar_heat_sec_i_m, dtype=dtype)
+    Q_int_heat_sec_i_m = np.asarray(Q_int_heat_sec_i_m, dtype=dtype)
+    Q_trans_heat_sec_i_m = np.asarray(Q_trans_heat_sec_i_m, dtype=dtype)
+    Q_vent_heat_sec_i_m = np.asarray(Q_vent_heat_sec_i_m, dtype=dtype)
+
+    # Compiled single-pass kernel (numba installed)
+    # ----------------------------------------------
+    if NUMBA_AVAILABLE:
+        return heating_kernel(
+            a, Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m,
+            np.empty_like(Q_trans_heat_sec_i_m))
+
+    return _net_heating_demand(a, Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m)
+
+
+def net_heating_demand_batch(C_sec_i, H_trans_heat_sec_i, H_vent_heat_sec_i, Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m, dtype=np.float64):
+    """
+    Net heating demand [MJ] of Z energy sectors at once (numpy.ndarray (Z, 12))
+
+    Inputs:
+    ------
+        - C_sec_i [J/K]: Effective heat capacity of each energy sector (numpy.ndarray (Z,))
+        - H_trans_heat_sec_i [W/K]: Transmission heat transfer coefficients (numpy.ndarray (Z,))
+        - H_vent_heat_sec_i [W/K]: Ventilation heat transfer coefficients (numpy.ndarray (Z,))
+        - Q_solar_heat_sec_i_m [MJ]: Monthly solar gains (numpy.ndarray (Z, 12))
+        - Q_int_heat_sec_i_m [MJ]: Monthly internal gains (numpy.ndarray (Z, 12))
+        - Q_trans_heat_sec_i_m [MJ]: Monthly transmission losses (numpy.ndarray (Z, 12))
+        - Q_vent_heat_sec_i_m [MJ]: Monthly ventilation losses (numpy.ndarray (Z, 12))
+        - dtype: Floating point precision of the monthly values (default = numpy.float64)
+
+    Outputs:
+    -------
+        - Net heating demand [MJ]: Monthly net heating demand per sector (numpy.ndarray (Z, 12))
+    """
+    a = numerical_parameter(
+        np.asarray(C_sec_i, dtype=np.float64),
+        np.asarray(H_trans_heat_sec_i, dtype=np.float64),
+        np.asarray(H_vent_heat_sec_i, dtype=np.float64))
+    Q_solar_heat_sec_i_m = np.asarray(Q_solar_heat_sec_i_m, dtype=dtype)
+    Q_int_heat_sec_i_m = np.asarray(Q_int_heat_sec_i_m, dtype=dtype)
+    Q_trans_heat_sec_i_m = np.asarray(Q_trans_heat_sec_i_m, dtype=dtype)
+    Q_vent_heat_sec_i_m = np.asarray(Q_vent_heat_sec_i_m, dtype=dtype)
+    if NUMBA_AVAILABLE:
+        return heating_kernel_batched(
+            a, Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m,
+            np.empty_like(Q_trans_heat_sec_i_m))
+
+    # Numerical parameters as a (Z, 1) column broadcast against the months
+    return _net_heating_demand(
+        a[:, None], Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m)
+
+
+def _net_heating_demand(a, Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m):
+    """
+    NumPy path of net_heating_demand: all monthly values have the shape of Q_trans_heat_sec_i_m
+    ((12,) or (Z, 12)), the other arguments may broadcast against it ((Z, 1) columns)
+    """
+    # Intermediate results are written into reusable scratch buffers
+    s = scratch(Q_trans_heat_sec_i_m.shape, Q_trans_heat_sec_i_m.dtype)
 
     # Total gains and losses (energetic sector)
     # ------------------------------------------
-    Q_loss_heat_sec_i_m = Q_trans_heat_sec_i_m + Q_vent_heat_sec_i_m  # MJ
-    Q_gain_heat_sec_i_m = Q_int_heat_sec_i_m + Q_solar_heat_sec_i_m  # MJ
+    Q_loss_heat_sec_i_m = np.add(
+        Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m, out=s.buf0)  # MJ
+    Q_gain_heat_sec_i_m = np.add(
+        Q_int_heat_sec_i_m, Q_solar_heat_sec_i_m, out=s.buf1)  # MJ
 
     # Heat balance ratio
     # ------------------
-    gamma_heat_sec_i_m = heat_balance_ratio_heating(
-        Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m)
+    # (computed from the sums above instead of calling heat_balance_ratio_heating)
+    gamma_heat_sec_i_m = balance_ratio(
+        Q_gain_heat_sec_i_m, Q_loss_heat_sec_i_m, out=s.buf2)  # [-], monthly gain-loss rate
 
     # Utilization factor
     # -------------------
-    eta_util_heat_sec_i_m = utilization_factor_heating(
-        C_sec_i, H_trans_heat_sec_i, H_vent_heat_sec_i, gamma_heat_sec_i_m)
+    eta_util_heat_sec_i_m = utilization_factor(gamma_heat_sec_i_m, a)
 
     # Net space heating demand, MJ
     # ------------------------------
-    Q_heat_net_sec_i_m = Q_loss_heat_sec_i_m - \
-        eta_util_heat_sec_i_m * Q_gain_heat_sec_i_m
-
-    # Allowance factor
-    # ------------------
-    f_allow_heat_sec_i_m = allowance_factor_heating(gamma_heat_sec_i_m)
+    # (written into the eta array, which is not needed afterwards)
+    Q_heat_net_sec_i_m = np.multiply(
+        eta_util_heat_sec_i_m, Q_gain_heat_sec_i_m, out=eta_util_heat_sec_i_m)
+    np.subtract(Q_loss_heat_sec_i_m, Q_heat_net_sec_i_m, out=Q_heat_net_sec_i_m)
 
-    # Applying allowance factor to heating needs
-    # -------------------------------------------
-    Q_heat_net_sec_i_m = Q_heat_net_sec_i_m * f_allow_heat_sec_i_m
+    # Applying allowance factor to heating needs (see allowance_factor_heating)
+    # --------------------------------------------------------------------------
+    # (set to 0 rather than multiplied, so a NaN month outside the range is 0 too)
+    np.copyto(Q_heat_net_sec_i_m, 0, where=~(gamma_heat_sec_i_m < 2.5))
 
     return Q_heat_net_sec_i_m
 
@@ -70,23 +141,8 @@ def utilization_factor_heating(C_sec_i, H_trans_heat_sec_i, H_vent_heat_sec_i, g
         - Utilization factor (eta_util_heat_sec_i_m) [-]: Monthly utilization factor (numpy.ndarray (12,))
     """
 
-    tau_heat_sec_i = C_sec_i / \
-        (H_trans_heat_sec_i + H_vent_heat_sec_i)  # s Time constant of the building zone
-    # [-] Dimensionless numerical parameter
-    a = 1 + tau_heat_sec_i / 54_000
-
-    eta_util_heat_sec_i_m = np.array([])
-
-    for item in gamma_heat_sec_i_m.flatten():
-
-        if item == 1:
-            eta_util_heat_sec_i_m_j = a/(a+1)
-        else:
-            eta_util_heat_sec_i_m_j = (
-                1-item**a)/(1-item**(a+1))
-
-        eta_util_heat_sec_i_m = np.append(
-            eta_util_heat_sec_i_m, eta_util_heat_sec_i_m_j)
+    a = numerical_parameter(C_sec_i, H_trans_heat_sec_i, H_vent_heat_sec_i)
+    eta_util_heat_sec_i_m = utilization_factor(gamma_heat_sec_i_m, a)
 
     return eta_util_heat_sec_i_m
 
@@ -107,12 +163,15 @@ def heat_balance_ratio_heating(Q_solar_heat_sec_i_m, Q_int_heat_sec_i_m, Q_trans
         - Heat balance ratio (gamma_heat_sec_i_m) [-]: Monthly heat balance ratio (numpy.ndarray (12,))
     """
     # Gain and losses
-    Q_loss_heat_sec_i_m = Q_trans_heat_sec_i_m + Q_vent_heat_sec_i_m  # MJ
-    Q_gain_heat_sec_i_m = Q_int_heat_sec_i_m + Q_solar_heat_sec_i_m  # MJ
+    s = scratch(np.shape(Q_trans_heat_sec_i_m))
+    Q_loss_heat_sec_i_m = np.add(
+        Q_trans_heat_sec_i_m, Q_vent_heat_sec_i_m, out=s.buf0)  # MJ
+    Q_gain_heat_sec_i_m = np.add(
+        Q_int_heat_sec_i_m, Q_solar_heat_sec_i_m, out=s.buf1)  # MJ
 
     # Heat balance ratio (gamma_heat_sec_i_m)
-    gamma_heat_sec_i_m = Q_gain_heat_sec_i_m / \
-        Q_loss_heat_sec_i_m  # [-], monthly gain-loss rate
+    gamma_heat_sec_i_m = balance_ratio(
+        Q_gain_heat_sec_i_m, Q_loss_heat_sec_i_m)  # [-], monthly gain-loss rate
     return gamma_heat_sec_i_m
 
 
@@ -128,16 +187,6 @@ def allowance_factor_heating(gamma_heat_sec_i_m):
     -------
         - Heating allowance factor (f_allow_heat_sec_i_m) [-]: Monthly heating allowance factor to be included when calculating net heating demand (numpy.ndarray (12,))
     """
-    f_allow_heat_sec_i_m = np.array([])
-
-    for item in gamma_heat_sec_i_m.flatten():
-        if item < 2.5:
-            f_allow_heat_sec_i_m_j = 1
-        else:
-            f_allow_heat_sec_i_m_j = 0
-
-        f_allow_heat_sec_i_m = np.append(
-            f_allow_heat_sec_i_m, f_allow_heat_sec_i_m_j)
-    f_allow_heat_sec_i_m = f_allow_heat_sec_i_m.flatten()
+    f_allow_heat_sec_i_m = (gamma_heat_sec_i_m < 2.5).astype(gamma_heat_sec_i_m.dtype)
 
     return f_allow_heat_sec_i_m
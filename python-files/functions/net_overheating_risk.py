@@ -1,7 +1,17 @@
 import numpy as np
 
+from functions._kernels import NUMBA_AVAILABLE, overheating_degree_kernel
+from functions._scratch import scratch
+from functions.thermal_parameters import balance_ratio, numerical_parameter, utilization_factor
 
-def yearly_overheating_degree(C_sec_i, H_trans_overh_sec_i, H_vent_overh_sec_i_m, Q_solar_overh_sec_i_m, Q_int_overh_sec_i_m, Q_trans_overh_sec_i_m, Q_vent_overh_sec_i_m):
+I_OVERH_THRESH = 1_000  # Kh
+I_OVERH_MAX = 6_500  # Kh
+_P_COOL_SLOPE = 1 / (I_OVERH_MAX - I_OVERH_THRESH)  # 1/Kh
+_F_COOL_SLOPE = 0.05 / I_OVERH_MAX  # 1/Kh
+_MJ_PER_W_K_TO_KH = 1_000 / 3.6  # Kh per MJ/(W/K)
+
+
+def yearly_overheating_degree(C_sec_i, H_trans_overh_sec_i, H_vent_overh_sec_i_m, Q_solar_overh_sec_i_m, Q_int_overh_sec_i_m, Q_trans_overh_sec_i_m, Q_vent_overh_sec_i_m, params=None, dtype=np.float64):
     """
     Overheating risk (yearly)
 
@@ -14,6 +24,8 @@ def yearly_overheating_degree(C_sec_i, H_trans_overh_sec_i, H_vent_overh_sec_i_m
             - Q_int_overh_sec_i_m [MJ]: Monthly internal gains per thermal zone (numpy.ndarray (12,))
             - Q_trans_overh_sec_i_m [MJ]: Monthly transmission losses thermal zone (numpy.ndarray (12,))
             - Q_vent_overh_sec_i_m [MJ]: Monthly ventilation losses per thermal zone (numpy.ndarray (12,))
+            - params: Precomputed numerical parameters, a_overh_m is used instead of C_sec_i and H when given (BuildingThermalParams)
+            - dtype: Floating point precision of the monthly values (default = numpy.float64)
 
     Outputs:
     -------
@@ -21,28 +33,58 @@ def yearly_overheating_degree(C_sec_i, H_trans_overh_sec_i, H_vent_overh_sec_i_m
             - Active cooling probability (p_cool_sec_i)
             - Time fraction over 25°C (f_cool_sec_i)
     """
-    # Total gains and losses (energetic sector)
-    # ------------------------------------------
-    # Q_loss_overh_sec_i_m = Q_trans_overh_sec_i_m + Q_vent_overh_sec_i_m  # MJ
-    # Q_gain_overh_sec_i_m = Q_int_overh_sec_i_m + Q_solar_overh_sec_i_m  # MJ
-
-    # Heat balance ratio
-    # ------------------
-    gamma_overh_sec_i_m = heat_balance_ratio_overheating(
-        Q_solar_overh_sec_i_m, Q_int_overh_sec_i_m, Q_trans_overh_sec_i_m, Q_vent_overh_sec_i_m)
-
-    # Utilization factor
-    # -------------------
-    eta_util_overh_sec_i_m = utilization_factor_overheating(
-        C_sec_i, H_trans_overh_sec_i, H_vent_overh_sec_i_m, gamma_overh_sec_i_m)
-
-    # Overheating risk (yearly)
-    # -------------------------
-    f_cool_geo_sec_i_m = 0
-    Q_gain_overh_sec_i_m = Q_int_overh_sec_i_m + Q_solar_overh_sec_i_m  # MJ
-    Q_excess_norm_sec_i_m = ((1 - eta_util_overh_sec_i_m) * (1 - f_cool_geo_sec_i_m) *
-                             Q_gain_overh_sec_i_m) / (H_trans_overh_sec_i + H_vent_overh_sec_i_m) * 1_000 / 3.6  # Kh
-    I_overh_sec_i = np.sum(Q_excess_norm_sec_i_m)  # Kh
+    if params is None:
+        a_sec_i_m = numerical_parameter(
+            C_sec_i, H_trans_overh_sec_i, H_vent_overh_sec_i_m)
+    else:
+        a_sec_i_m = params.a_overh_m
+
+    Q_solar_overh_sec_i_m = np.asarray(Q_solar_overh_sec_i_m, dtype=dtype)
+    Q_int_overh_sec_i_m = np.asarray(Q_int_overh_sec_i_m, dtype=dtype)
+    Q_trans_overh_sec_i_m = np.asarray(Q_trans_overh_sec_i_m, dtype=dtype)
+    Q_vent_overh_sec_i_m = np.asarray(Q_vent_overh_sec_i_m, dtype=dtype)
+
+    # Geothermal cooling fraction f_cool_geo_sec_i_m = 0: the (1 - f_cool_geo_sec_i_m)
+    # factor is left out, add it back as an argument if it becomes a parameter
+
+    # Compiled single-pass kernel (numba installed)
+    # ----------------------------------------------
+    if NUMBA_AVAILABLE:
+        # Same scalar type as the NumPy path (numpy scalar of the monthly dtype)
+        I_overh_sec_i = Q_int_overh_sec_i_m.dtype.type(overheating_degree_kernel(
+            np.asarray(a_sec_i_m, dtype=np.float64), H_trans_overh_sec_i,
+            np.asarray(H_vent_overh_sec_i_m, dtype=np.float64),
+            Q_solar_overh_sec_i_m, Q_int_overh_sec_i_m, Q_trans_overh_sec_i_m, Q_vent_overh_sec_i_m))  # Kh
+    else:
+        # Intermediate results are written into reusable scratch buffers
+        s = scratch(Q_int_overh_sec_i_m.shape, Q_int_overh_sec_i_m.dtype)
+
+        # Total gains and losses (energetic sector)
+        # ------------------------------------------
+        Q_loss_overh_sec_i_m = np.add(
+            Q_trans_overh_sec_i_m, Q_vent_overh_sec_i_m, out=s.buf0)  # MJ
+        Q_gain_overh_sec_i_m = np.add(
+            Q_int_overh_sec_i_m, Q_solar_overh_sec_i_m, out=s.buf1)  # MJ
+
+        # Heat balance ratio and utilization factor
+        # -----------------------------------------
+        # (computed from the sums above instead of calling heat_balance_ratio_overheating)
+        gamma_overh_sec_i_m = balance_ratio(
+            Q_gain_overh_sec_i_m, Q_loss_overh_sec_i_m, out=s.buf2)  # [-]
+        eta_util_overh_sec_i_m = utilization_factor(
+            gamma_overh_sec_i_m, a_sec_i_m)
+
+        # Overheating risk (yearly)
+        # -------------------------
+        H_overh_sec_i_m = np.add(
+            H_trans_overh_sec_i, H_vent_overh_sec_i_m, out=s.buf3)  # W/K
+        # (written into the eta array, which is not needed afterwards)
+        Q_excess_norm_sec_i_m = np.subtract(
+            1, eta_util_overh_sec_i_m, out=eta_util_overh_sec_i_m)
+        Q_excess_norm_sec_i_m *= Q_gain_overh_sec_i_m
+        Q_excess_norm_sec_i_m /= H_overh_sec_i_m  # MJ/(W/K)
+        # Unit conversion applied once to the yearly sum
+        I_overh_sec_i = Q_excess_norm_sec_i_m.sum() * _MJ_PER_W_K_TO_KH  # Kh
 
     # Active cooling probability
     # --------------------------
@@ -67,12 +109,15 @@ def heat_balance_ratio_overheating(Q_solar_overh_sec_i_m, Q_int_overh_sec_i_m, Q
         - Heat balance ratio (gamma_overh_sec_i_m) [-]: Monthly heat balance ratio (numpy.ndarray (12,))
     """
     # Gain and losses
-    Q_loss_overh_sec_i_m = Q_trans_overh_sec_i_m + Q_vent_overh_sec_i_m  # MJ
-    Q_gain_overh_sec_i_m = Q_int_overh_sec_i_m + Q_solar_overh_sec_i_m  # MJ
+    s = scratch(np.shape(Q_trans_overh_sec_i_m))
+    Q_loss_overh_sec_i_m = np.add(
+        Q_trans_overh_sec_i_m, Q_vent_overh_sec_i_m, out=s.buf0)  # MJ
+    Q_gain_overh_sec_i_m = np.add(
+        Q_int_overh_sec_i_m, Q_solar_overh_sec_i_m, out=s.buf1)  # MJ
 
     # Heat balance ratio (gamma_heat_sec_i_m)
-    gamma_overh_sec_i_m = Q_gain_overh_sec_i_m / \
-        Q_loss_overh_sec_i_m  # [-], monthly gain-loss rate
+    gamma_overh_sec_i_m = balance_ratio(
+        Q_gain_overh_sec_i_m, Q_loss_overh_sec_i_m)  # [-], monthly gain-loss rate
     return gamma_overh_sec_i_m
 
 
@@ -89,37 +134,27 @@ def utilization_factor_overheating(C_sec_i, H_trans_overh_sec_i, H_vent_overh_se
         - Utilization factor (eta_util_overh_sec_i_m) [-]: Monthly utilization factor (numpy.ndarray (12,))
     """
 
-    tau_overh_sec_i_m = C_sec_i / \
-        (H_trans_overh_sec_i +
-         H_vent_overh_sec_i_m)  # s Time constant of the building zone
-    # [-] Dimensionless numerical parameter
-    a_sec_i_m = 1 + tau_overh_sec_i_m / 54_000
-
-    eta_util_overh_sec_i_m = np.array([])
-
-    for a, gamma in zip(a_sec_i_m.flatten(), gamma_overh_sec_i_m.flatten()):
-
-        if gamma == 1:
-            eta_util_overh_sec_i_m_j = a/(a+1)
-        else:
-            eta_util_overh_sec_i_m_j = (
-                1-gamma**a)/(1-gamma**(a+1))
-
-        eta_util_overh_sec_i_m = np.append(
-            eta_util_overh_sec_i_m, eta_util_overh_sec_i_m_j)
+    a_sec_i_m = numerical_parameter(
+        C_sec_i, H_trans_overh_sec_i, H_vent_overh_sec_i_m)
+    eta_util_overh_sec_i_m = utilization_factor(gamma_overh_sec_i_m, a_sec_i_m)
 
     return eta_util_overh_sec_i_m
 
 
 def active_cooling_probability(I_overh_sec_i):
-    I_overh_thresh = 1_000  # Kh
-    I_overh_max = 6_500  # Kh
-    p_cool_sec_i = max(
-        0, min((I_overh_sec_i - I_overh_thresh)/(I_overh_max - I_overh_thresh), 1))  # [-]
+    p_cool_sec_i = _clamp_unit(
+        (I_overh_sec_i - I_OVERH_THRESH) * _P_COOL_SLOPE)  # [-]
     return p_cool_sec_i
 
 
 def time_fraction_over_25C(I_overh_sec_i):
-    I_overh_max = 6_500  # Kh
-    f_cool_sec_i = max(0, min(0.05 * I_overh_sec_i/I_overh_max, 1))  # [-]
+    f_cool_sec_i = _clamp_unit(I_overh_sec_i * _F_COOL_SLOPE)  # [-]
     return f_cool_sec_i
+
+
+def _clamp_unit(x):
+    # Clamp to [0, 1]; NaN propagates in both branches, as in np.clip.
+    # Comparisons for a single sector (np.clip costs ~10x more on a scalar)
+    if isinstance(x, np.ndarray):
+        return np.clip(x, 0, 1)
+    return 0.0 if x < 0 else 1.0 if x > 1 else x
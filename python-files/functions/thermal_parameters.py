@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from functions._scratch import scratch
+
+TAU_0 = 54_000  # s, reference time constant
+_INV_TAU_0 = 1 / TAU_0  # 1/s
+
+
+# ---------------------
+# Utilization factor
+# ---------------------
+def numerical_parameter(C_sec_i, H_trans_sec_i, H_vent_sec_i):
+    """
+    Dimensionless numerical parameter of the utilization factor
+    Inputs:
+            - C_sec_i [J/K]: Effective heat capacity of the energy sector (float)
+            - H_trans_sec_i [W/K]: Transmission heat transfer coefficient (float)
+            - H_vent_sec_i [W/K]: Ventilation heat transfer coefficient (float or numpy.ndarray (12,))
+    Outputs:
+            - a [-]: 1 + tau / tau_0 (float or numpy.ndarray (12,))
+    """
+    tau_sec_i = C_sec_i / \
+        (H_trans_sec_i + H_vent_sec_i)  # s Time constant of the building zone
+    a = 1 + tau_sec_i * _INV_TAU_0  # [-]
+    return a
+
+
+def balance_ratio(Q_num_sec_i_m, Q_den_sec_i_m, out=None):
+    """
+    Heat balance ratio [-]: Q_num / Q_den, +inf where Q_den == 0 (limit where the utilization factor is 0)
+    Inputs:
+            - Q_num_sec_i_m [MJ]: Monthly gains (heating, overheating) or losses (cooling) (numpy.ndarray (12,))
+            - Q_den_sec_i_m [MJ]: Monthly losses (heating, overheating) or gains (cooling) (numpy.ndarray (12,))
+            - out: Array the ratio is written into (default = new array)
+    Outputs:
+            - Heat balance ratio [-]: Monthly heat balance ratio (numpy.ndarray (12,))
+    """
+    if out is None:
+        out = np.empty(np.broadcast(Q_num_sec_i_m, Q_den_sec_i_m).shape,
+                       dtype=np.result_type(Q_num_sec_i_m, Q_den_sec_i_m))
+    out.fill(np.inf)
+    return np.divide(Q_num_sec_i_m, Q_den_sec_i_m, out=out, where=Q_den_sec_i_m != 0)
+
+
+def utilization_factor(gamma_sec_i_m, a):
+    """
+    Utilization factor [-] from the heat balance ratio and the numerical parameter
+    Inputs:
+            - gamma_sec_i_m [-]: Monthly heat balance ratio (numpy.ndarray (12,))
+            - a [-]: Dimensionless numerical parameter (float or numpy.ndarray (12,))
+    Outputs:
+            - Utilization factor (eta_util_sec_i_m) [-]: Monthly utilization factor (numpy.ndarray (12,))
+    """
+    # gamma**(a+1) is obtained as gamma**a * gamma to avoid a second power
+    gamma_sec_i_m = np.asarray(gamma_sec_i_m)
+    dtype = np.result_type(gamma_sec_i_m, np.float32)
+    # a in the precision of gamma, a float64 a would promote a/(a+1) and the result
+    a = np.asarray(a, dtype=dtype)
+    s = scratch(gamma_sec_i_m.shape, dtype)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        gamma_pow_a = np.power(gamma_sec_i_m, a, out=s.power)
+        eta_util_sec_i_m = np.where(
+            np.isclose(gamma_sec_i_m, 1), a/(a+1),
+            (1-gamma_pow_a)/(1-gamma_pow_a*gamma_sec_i_m))
+    # gamma == +inf (no losses, see balance_ratio): eta tends to 0
+    eta_util_sec_i_m[gamma_sec_i_m == np.inf] = 0
+    return eta_util_sec_i_m
+
+
+@dataclass(frozen=True)
+class BuildingThermalParams:
+    """
+    Numerical parameters of the utilization factors, computed once per energy sector
+    Attributes:
+            - a_heat [-]: Heating (float)
+            - a_overh_m [-]: Overheating, monthly (numpy.ndarray (12,))
+            - a_cool_m [-]: Cooling, monthly (numpy.ndarray (12,))
+    """
+    a_heat: float
+    a_overh_m: np.ndarray
+    a_cool_m: np.ndarray
+
+    @classmethod
+    def from_sector(cls, C_sec_i, H_trans_heat_sec_i, H_vent_heat_sec_i, H_trans_overh_sec_i, H_vent_overh_sec_i_m, H_trans_cool_sec_i, H_vent_cool_sec_i_m):
+        a_heat = numerical_parameter(
+            C_sec_i, H_trans_heat_sec_i, H_vent_heat_sec_i)
+        a_overh_m = numerical_parameter(
+            C_sec_i, H_trans_overh_sec_i, H_vent_overh_sec_i_m)
+        a_cool_m = numerical_parameter(
+            C_sec_i, H_trans_cool_sec_i, H_vent_cool_sec_i_m)
+        return cls(a_heat, a_overh_m, a_cool_m)
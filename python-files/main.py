@@ -1,11 +1,11 @@
-import numpy as np
+from constants import T_M_DEFAULT
 from models.models import EnergySector
 
 
 def main():
     V_sec_i = 10    
-    t_m = (np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])*(24*3600)/1_000_000).tolist()
-    energy_sector_1 = EnergySector(V_sec_i, t_m)
+    t_m = T_M_DEFAULT
+    energy_sector_1 = EnergySector(V_sec_i=V_sec_i, t_m=t_m)
     return energy_sector_1
     
 if __name__ == "__main__":
@@ -9,37 +9,35 @@ import numpy as np
 # Internal Gains
 # ---------------------
 
-def internal_gains(V_sec_i: float, t_m: list) -> list:
+def internal_gains(V_sec_i: float, t_m: np.ndarray) -> np.ndarray:
     """
     Internal gains (monthly)
     Inputs:
-            - V_sec_i [m³]: House / appartment total volume (float)
+            - V_sec_i [m³]: House / appartment total volume (float or numpy.ndarray (N,))
             - t_m [Ms]: Month time length (numpy.ndarray (12,))
     Outputs:
-            - Internal gains [MJ]: Monthly internal gains for heating, overheating and cooling (numpy.ndarray (12,))
+            - Internal gains [MJ]: Monthly internal gains for heating, overheating and cooling (numpy.ndarray (12,) or (N, 12))
     """
-    t_m = np.array(t_m)
-    V_EPR = V_sec_i  # m³
+    V_EPR = np.asarray(V_sec_i)  # m³
 
-    if V_EPR <= 192:
-        Q_int_sec_i_m = (1.41 * V_EPR + 78) * V_sec_i/V_EPR * t_m  # MJ
-    else:
-        Q_int_sec_i_m = (0.67 * V_EPR + 220) * V_sec_i/V_EPR * t_m  # MJ
+    q_int_sec_i = np.where(V_EPR <= 192, 1.41 * V_EPR + 78, 0.67 * V_EPR + 220)
+    Q_int_sec_i_m = (q_int_sec_i * V_sec_i/V_EPR)[..., None] * t_m  # MJ
+    Q_int_sec_i_m.setflags(write=False)
 
-    return Q_int_sec_i_m.tolist()
+    return Q_int_sec_i_m
 
 
-def internal_gains_heating(V_sec_i: float, t_m: list) -> list:
+def internal_gains_heating(V_sec_i: float, t_m: np.ndarray) -> np.ndarray:
     Q_int_heat_sec_i_m = internal_gains(V_sec_i, t_m)
     return Q_int_heat_sec_i_m
 
 
-def internal_gains_heating(V_sec_i: float, t_m: list) -> list:
+def internal_gains_overheating(V_sec_i: float, t_m: np.ndarray) -> np.ndarray:
     Q_int_overh_sec_i_m = internal_gains(V_sec_i, t_m)
     return Q_int_overh_sec_i_m
 
 
-def internal_gains_cooling(V_sec_i: float, t_m: list) -> list:
+def internal_gains_cooling(V_sec_i: float, t_m: np.ndarray) -> np.ndarray:
     Q_int_cool_sec_i_m = internal_gains(V_sec_i, t_m)
     return Q_int_cool_sec_i_m
 
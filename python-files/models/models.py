@@ -1,6 +1,8 @@
-from typing import Union
-from pydantic import BaseModel, Field
-from functions.monthly_gains_and_losses import internal_gains
+from dataclasses import dataclass, field
+
+import numpy as np
+from pydantic import BaseModel
+from functions.monthly_gains_and_losses import internal_gains_heating
 
 # Building
 # -----------
@@ -48,14 +50,42 @@ class VentilationZone(BaseModel):
 # --------------
 
 
-class EnergySector(BaseModel):
-    V_sec_i: float = Field(...)
-    t_m: list = Field(...)
-    print(type(V_sec_i))
-    print(type(t_m))
-    Q_int_heat_sec_i_m = internal_gains(V_sec_i=V_sec_i, t_m=t_m)
-    # Q_int_overh_sec_i_m = Field(default=internal_gains(V_sec_i=V_sec_i, t_m=t_m))
-    # Q_int_cool_sec_i_m = Field(default=internal_gains(V_sec_i=V_sec_i, t_m=t_m))
+# eq=False: fields are arrays, sectors compare by identity.
+# _Q_int_sec_i_m is a private cache for Q_int_heat_sec_i_m: it is a dataclass
+# field (slots=True only creates slots for fields), so dataclasses.fields()
+# and asdict() list it, but it is not an __init__ argument.
+@dataclass(slots=True, eq=False)
+class EnergySector:
+    V_sec_i: float
+    t_m: np.ndarray
+    _Q_int_sec_i_m: np.ndarray = field(
+        default=None, init=False, repr=False, compare=False)
+
+    @property
+    def Q_int_heat_sec_i_m(self) -> np.ndarray:
+        # Computed on first access, once per instance (read-only array);
+        # cached by hand in a slot since cached_property needs a __dict__
+        if self._Q_int_sec_i_m is None:
+            self._Q_int_sec_i_m = internal_gains_heating(
+                V_sec_i=self.V_sec_i, t_m=self.t_m)
+        return self._Q_int_sec_i_m
+
+    # Overheating and cooling share the heating internal gains array
+    @property
+    def Q_int_overh_sec_i_m(self) -> np.ndarray:
+        return self.Q_int_heat_sec_i_m
+
+    @property
+    def Q_int_cool_sec_i_m(self) -> np.ndarray:
+        return self.Q_int_heat_sec_i_m
+
+    @classmethod
+    def batch(cls, V_sec_i, t_m):
+        """
+        N energy sectors in one instance: V_sec_i is a (N,) array and the
+        internal gains are (N, 12) arrays, one row per sector
+        """
+        return cls(np.asarray(V_sec_i, dtype=np.float64), t_m)
 
 
 # class EnergySector:
@@ -0,0 +1,177 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+import functions.net_cooling_energy_needs as cooling
+import functions.net_heating_energy_needs as heating
+import functions.net_overheating_risk as overheating
+
+Z = 64
+OVERFLOW, JULY = 40, 6
+
+
+@pytest.fixture
+def sectors():
+    """
+    Random sectors, with months of zero losses and zero gains, months with a
+    heat balance ratio close to 1 and months with negative losses (T_e above
+    the set-point), and one sector whose July gamma**a overflows
+    """
+    rng = np.random.default_rng(0)
+    Q_solar = rng.random((Z, 12)) * 400
+    Q_int = rng.random((Z, 12)) * 300
+    Q_trans = rng.random((Z, 12)) * 900
+    Q_vent = rng.random((Z, 12)) * 300
+    Q_trans[:8, 0] = Q_vent[:8, 0] = 0  # no losses
+    Q_solar[8:16, 1] = Q_int[8:16, 1] = 0  # no gains
+    Q_trans[16:24, 2] = (Q_int + Q_solar)[16:24, 2] * (1 + 1e-7) - Q_vent[16:24, 2]  # gamma ~ 1
+    Q_trans[24:32, 3] = (Q_int + Q_solar)[24:32, 3] * (1 + 5e-5) - Q_vent[24:32, 3]  # gamma near 1
+    Q_trans[32:40, 4] = -2 * Q_vent[32:40, 4]  # negative losses
+    C = rng.random(Z) * 1e8 + 1e6
+    H_trans = rng.random(Z) * 150 + 20
+    H_vent = rng.random(Z) * 60 + 5
+    # gamma = 500 in July with a ~ 286: gamma**a overflows, outside the allowance
+    C[OVERFLOW], H_trans[OVERFLOW], H_vent[OVERFLOW] = 2e9, 100, 30
+    Q_solar[OVERFLOW, JULY], Q_int[OVERFLOW, JULY] = 0, 500
+    Q_trans[OVERFLOW, JULY] = Q_vent[OVERFLOW, JULY] = 0.5
+    return dict(
+        C=C,
+        H_trans=H_trans,
+        H_vent=H_vent,
+        H_vent_m=rng.random((Z, 12)) * 60 + 5,
+        p_cool=rng.random(Z),
+        Q=(Q_solar, Q_int, Q_trans, Q_vent))
+
+
+def reference_utilization_factor(gamma, a):
+    # Original month-by-month loop of utilization_factor_*
+    a = np.broadcast_to(a, gamma.shape)
+    return np.array([a_j/(a_j+1) if gamma_j == 1 else (1-gamma_j**a_j)/(1-gamma_j**(a_j+1))
+                     for gamma_j, a_j in zip(gamma, a)])
+
+
+def use_numba(monkeypatch, numba_available):
+    for module in (heating, cooling, overheating):
+        monkeypatch.setattr(module, "NUMBA_AVAILABLE", numba_available)
+
+
+def both_paths(monkeypatch, module, func):
+    monkeypatch.setattr(module, "NUMBA_AVAILABLE", True)
+    compiled = func()
+    monkeypatch.setattr(module, "NUMBA_AVAILABLE", False)
+    numpy_path = func()
+    assert type(compiled) is type(numpy_path)
+    np.testing.assert_allclose(compiled, numpy_path, rtol=1e-9, atol=1e-9)
+    return numpy_path
+
+
+@pytest.mark.parametrize("z", range(Z))
+def test_net_heating_demand(monkeypatch, sectors, z):
+    s = sectors
+    Q = [q[z] for q in s["Q"]]
+    both_paths(monkeypatch, heating, lambda: heating.net_heating_demand(
+        s["C"][z], s["H_trans"][z], s["H_vent"][z], *Q))
+
+
+@pytest.mark.parametrize("z", range(Z))
+def test_net_cooling_demand(monkeypatch, sectors, z):
+    s = sectors
+    Q = [q[z] for q in s["Q"]]
+    both_paths(monkeypatch, cooling, lambda: cooling.net_cooling_demand(
+        s["C"][z], s["H_trans"][z], s["H_vent_m"][z], *Q, s["p_cool"][z]))
+
+
+@pytest.mark.parametrize("z", range(Z))
+def test_yearly_overheating_degree(monkeypatch, sectors, z):
+    s = sectors
+    Q = [q[z] for q in s["Q"]]
+    both_paths(monkeypatch, overheating, lambda: overheating.yearly_overheating_degree(
+        s["C"][z], s["H_trans"][z], s["H_vent_m"][z], *Q)[0])
+
+
+@pytest.mark.parametrize("numba_available", (True, False))
+def test_allowance_zeroes_overflowing_month(monkeypatch, sectors, numba_available):
+    s = sectors
+    monkeypatch.setattr(heating, "NUMBA_AVAILABLE", numba_available)
+    Q = [q[OVERFLOW] for q in s["Q"]]
+    Q_heat = heating.net_heating_demand(
+        s["C"][OVERFLOW], s["H_trans"][OVERFLOW], s["H_vent"][OVERFLOW], *Q)
+    assert Q_heat[JULY] == 0
+
+
+@pytest.mark.parametrize("numba_available", (True, False))
+def test_zero_denominator_months(monkeypatch, sectors, numba_available):
+    s = sectors
+    use_numba(monkeypatch, numba_available)
+    for z in range(16):
+        Q = [q[z] for q in s["Q"]]
+        Q_heat = heating.net_heating_demand(s["C"][z], s["H_trans"][z], s["H_vent"][z], *Q)
+        Q_cool = cooling.net_cooling_demand(
+            s["C"][z], s["H_trans"][z], s["H_vent_m"][z], *Q, s["p_cool"][z])
+        I_overh = overheating.yearly_overheating_degree(
+            s["C"][z], s["H_trans"][z], s["H_vent_m"][z], *Q)[0]
+        if z < 8:  # no losses in January: no heating, all gains count as overheating
+            assert Q_heat[0] == 0
+            assert np.isfinite(I_overh)
+        else:  # no gains in February: no cooling, heating covers all losses
+            assert Q_cool[1] == 0
+            np.testing.assert_allclose(Q_heat[1], Q[2][1] + Q[3][1], rtol=1e-12)
+        assert np.isfinite(Q_heat).all() and np.isfinite(Q_cool).all()
+
+
+@pytest.mark.parametrize("numba_available", (True, False))
+def test_matches_reference_formula(monkeypatch, sectors, numba_available):
+    s = sectors
+    use_numba(monkeypatch, numba_available)
+    for z in range(OVERFLOW + 1, Z):  # well-conditioned sectors only
+        C, H_trans, H_vent, H_vent_m, p_cool = (
+            s["C"][z], s["H_trans"][z], s["H_vent"][z], s["H_vent_m"][z], s["p_cool"][z])
+        Q = [q[z] for q in s["Q"]]
+        Q_loss, Q_gain = Q[2] + Q[3], Q[0] + Q[1]
+
+        a = 1 + C / (H_trans + H_vent) / 54_000
+        gamma = Q_gain / Q_loss
+        Q_heat = (Q_loss - reference_utilization_factor(gamma, a) * Q_gain) * (gamma < 2.5)
+        np.testing.assert_allclose(
+            heating.net_heating_demand(C, H_trans, H_vent, *Q), Q_heat, rtol=1e-9, atol=1e-9)
+
+        a_m = 1 + C / (H_trans + H_vent_m) / 54_000
+        lambda_ = Q_loss / Q_gain
+        Q_cool = p_cool * (Q_gain - reference_utilization_factor(lambda_, a_m) * Q_loss) * (lambda_ < 2.5)
+        np.testing.assert_allclose(
+            cooling.net_cooling_demand(C, H_trans, H_vent_m, *Q, p_cool), Q_cool, rtol=1e-9, atol=1e-9)
+
+        I_overh = np.sum((1 - reference_utilization_factor(gamma, a_m)) * Q_gain
+                         / (H_trans + H_vent_m) * 1_000 / 3.6)
+        np.testing.assert_allclose(
+            overheating.yearly_overheating_degree(C, H_trans, H_vent_m, *Q)[0], I_overh, rtol=1e-9)
+
+
+def test_batches_match_single_sector(monkeypatch, sectors):
+    s = sectors
+    Q_heat = both_paths(monkeypatch, heating, lambda: heating.net_heating_demand_batch(
+        s["C"], s["H_trans"], s["H_vent"], *s["Q"]))
+    Q_cool = both_paths(monkeypatch, cooling, lambda: cooling.net_cooling_demand_batch(
+        s["C"], s["H_trans"], s["H_vent_m"], *s["Q"], s["p_cool"]))
+    for z in range(Z):
+        Q = [q[z] for q in s["Q"]]
+        np.testing.assert_allclose(Q_heat[z], heating.net_heating_demand(
+            s["C"][z], s["H_trans"][z], s["H_vent"][z], *Q), rtol=1e-12)
+        np.testing.assert_allclose(Q_cool[z], cooling.net_cooling_demand(
+            s["C"][z], s["H_trans"][z], s["H_vent_m"][z], *Q, s["p_cool"][z]), rtol=1e-12)
+
+
+def test_float32_close_to_float64(monkeypatch, sectors):
+    s = sectors
+    rows = slice(OVERFLOW + 1, Z)  # well-conditioned sectors only
+    for module, func in (
+            (heating, lambda dtype: heating.net_heating_demand_batch(
+                s["C"][rows], s["H_trans"][rows], s["H_vent"][rows], *[q[rows] for q in s["Q"]], dtype=dtype)),
+            (cooling, lambda dtype: cooling.net_cooling_demand_batch(
+                s["C"][rows], s["H_trans"][rows], s["H_vent_m"][rows], *[q[rows] for q in s["Q"]], s["p_cool"][rows], dtype=dtype))):
+        for numba_available in (True, False):
+            monkeypatch.setattr(module, "NUMBA_AVAILABLE", numba_available)
+            single = func(np.float32)
+            assert single.dtype == np.float32
+            np.testing.assert_allclose(single, func(np.float64), rtol=1e-4, atol=1e-2)